@@ -2,6 +2,7 @@
 
 import asyncio
 import os
+import threading
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -13,6 +14,7 @@ from config.settings import get_settings
 from providers.exceptions import ProviderError
 
 from .dependencies import cleanup_provider
+from .request_utils import warm_up_encoder
 from .routes import router
 
 # Opt-in to future behavior for python-telegram-bot
@@ -44,6 +46,9 @@ async def lifespan(app: FastAPI):
     settings = get_settings()
     logger.info("Starting Claude Code Proxy...")
 
+    # Pay tokenizer setup once at startup instead of on the first request
+    warm_up_encoder()
+
     # Initialize messaging platform if configured
     messaging_platform = None
     message_handler = None
@@ -134,6 +139,18 @@ async def lifespan(app: FastAPI):
                 f"{messaging_platform.name} platform started with message handler"
             )
 
+            # Compile the CUDA Whisper pipeline now instead of inside the first
+            # voice note; daemon so a slow compile never holds up shutdown.
+            if settings.voice_note_enabled and settings.whisper_device == "cuda":
+                from messaging.transcription import preload_pipeline
+
+                threading.Thread(
+                    target=preload_pipeline,
+                    args=(settings.whisper_model, settings.whisper_device),
+                    name="whisper-preload",
+                    daemon=True,
+                ).start()
+
     except ImportError as e:
         logger.warning(f"Messaging module import error: {e}")
     except Exception as e:
@@ -2,13 +2,17 @@
 
 import shlex
 
+_TWO_WORD_COMMANDS = frozenset(
+    {"git", "npm", "docker", "kubectl", "cargo", "go", "pip", "yarn"}
+)
+
 
 def extract_command_prefix(command: str) -> str:
     """Extract the command prefix for fast prefix detection.
 
-    Parses a shell command safely, handling environment variables and
-    command injection attempts. Returns the command prefix suitable
-    for quick identification.
+    Handles leading environment variable assignments and rejects command
+    injection attempts. Substitution syntax is rejected up front, so plain
+    whitespace tokenization is enough to find the first one or two words.
 
     Returns:
         Command prefix (e.g., "git", "git commit", "npm install")
@@ -17,48 +21,27 @@ def extract_command_prefix(command: str) -> str:
     if "`" in command or "$(" in command:
         return "command_injection_detected"
 
-    try:
-        parts = shlex.split(command, posix=False)
-        if not parts:
-            return "none"
-
-        env_prefix = []
-        cmd_start = 0
-        for i, part in enumerate(parts):
-            if "=" in part and not part.startswith("-"):
-                env_prefix.append(part)
-                cmd_start = i + 1
-            else:
-                break
-
-        if cmd_start >= len(parts):
-            return "none"
-
-        cmd_parts = parts[cmd_start:]
-        if not cmd_parts:
-            return "none"
-
-        first_word = cmd_parts[0]
-        two_word_commands = {
-            "git",
-            "npm",
-            "docker",
-            "kubectl",
-            "cargo",
-            "go",
-            "pip",
-            "yarn",
-        }
-
-        if first_word in two_word_commands and len(cmd_parts) > 1:
-            second_word = cmd_parts[1]
-            if not second_word.startswith("-"):
-                return f"{first_word} {second_word}"
-            return first_word
-        return first_word if not env_prefix else " ".join(env_prefix) + " " + first_word
-
-    except ValueError:
-        return command.split()[0] if command.split() else "none"
+    parts = command.split()
+
+    env_prefix: list[str] = []
+    cmd_start = 0
+    for part in parts:
+        if "=" in part and not part.startswith("-"):
+            env_prefix.append(part)
+            cmd_start += 1
+        else:
+            break
+
+    if cmd_start >= len(parts):
+        return "none"
+
+    first_word = parts[cmd_start]
+    if first_word in _TWO_WORD_COMMANDS and cmd_start + 1 < len(parts):
+        second_word = parts[cmd_start + 1]
+        if not second_word.startswith("-"):
+            return f"{first_word} {second_word}"
+        return first_word
+    return first_word if not env_prefix else " ".join(env_prefix) + " " + first_word
 
 
 def extract_filepaths_from_command(command: str, output: str) -> str:
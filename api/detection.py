@@ -51,7 +51,19 @@ def is_prefix_detection_request(request_data: MessagesRequest) -> tuple[bool, st
     if len(request_data.messages) != 1 or request_data.messages[0].role != "user":
         return False, ""
 
-    content = extract_text_from_content(request_data.messages[0].content)
+    raw_content = request_data.messages[0].content
+    if isinstance(raw_content, list):
+        # Only text from the block holding <policy_spec> onward can match, so
+        # skip joining large earlier blocks (or everything, when it is absent).
+        for i, block in enumerate(raw_content):
+            text = getattr(block, "text", "")
+            if isinstance(text, str) and "<policy_spec>" in text:
+                raw_content = raw_content[i:]
+                break
+        else:
+            return False, ""
+
+    content = extract_text_from_content(raw_content)
 
     if "<policy_spec>" in content and "Command:" in content:
         try:
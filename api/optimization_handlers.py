@@ -4,7 +4,7 @@ Each handler returns a MessagesResponse if the request matches and the
 optimization is enabled, otherwise None.
 """
 
-import uuid
+import secrets
 
 from loguru import logger
 
@@ -34,7 +34,7 @@ def try_prefix_detection(
         return None
 
     return MessagesResponse(
-        id=f"msg_{uuid.uuid4()}",
+        id=f"msg_{secrets.token_hex(16)}",
         model=request_data.model,
         content=[{"type": "text", "text": extract_command_prefix(command)}],
         stop_reason="end_turn",
@@ -53,7 +53,7 @@ def try_quota_mock(
 
     logger.info("Optimization: Intercepted and mocked quota probe")
     return MessagesResponse(
-        id=f"msg_{uuid.uuid4()}",
+        id=f"msg_{secrets.token_hex(16)}",
         model=request_data.model,
         role="assistant",
         content=[{"type": "text", "text": "Quota check passed."}],
@@ -73,7 +73,7 @@ def try_title_skip(
 
     logger.info("Optimization: Skipped title generation request")
     return MessagesResponse(
-        id=f"msg_{uuid.uuid4()}",
+        id=f"msg_{secrets.token_hex(16)}",
         model=request_data.model,
         role="assistant",
         content=[{"type": "text", "text": "Conversation"}],
@@ -93,7 +93,7 @@ def try_suggestion_skip(
 
     logger.info("Optimization: Skipped suggestion mode request")
     return MessagesResponse(
-        id=f"msg_{uuid.uuid4()}",
+        id=f"msg_{secrets.token_hex(16)}",
         model=request_data.model,
         role="assistant",
         content=[{"type": "text", "text": ""}],
@@ -116,7 +116,7 @@ def try_filepath_mock(
     filepaths = extract_filepaths_from_command(cmd, output)
     logger.info("Optimization: Mocked filepath extraction")
     return MessagesResponse(
-        id=f"msg_{uuid.uuid4()}",
+        id=f"msg_{secrets.token_hex(16)}",
         model=request_data.model,
         role="assistant",
         content=[{"type": "text", "text": filepaths}],
@@ -4,6 +4,9 @@ Contains token counting for API requests.
 """
 
 import json
+from collections import Counter
+from collections.abc import Callable
+from functools import lru_cache
 from typing import Any
 
 import tiktoken
@@ -11,7 +14,10 @@ from loguru import logger
 
 ENCODER = tiktoken.get_encoding("cl100k_base")
 
-__all__ = ["get_token_count"]
+# Strings longer than this bypass the token-count cache to bound its memory.
+_CACHE_MAX_CHARS = 64 * 1024
+
+__all__ = ["get_token_count", "warm_up_encoder"]
 
 
 def _get_block_attr(block: Any, key: str, default: Any = "") -> Any:
@@ -21,6 +27,100 @@ def _get_block_attr(block: Any, key: str, default: Any = "") -> Any:
     return getattr(block, key, default)
 
 
+def _json_text(value: Any) -> str:
+    """Text to tokenize for a JSON-like value.
+
+    Small dicts (typical tool inputs) skip serialization and use their keys
+    and values directly; the count is an estimate with per-block overhead
+    already added, so the missing JSON punctuation does not matter.
+    """
+    if isinstance(value, dict) and len(value) <= 3:
+        return "".join(f"{k}{v}" for k, v in value.items())
+    return json.dumps(value)
+
+
+def warm_up_encoder() -> None:
+    """Encode once so the first request does not pay the encoder's setup cost."""
+    ENCODER.encode("warmup")
+
+
+@lru_cache(maxsize=4096)
+def _count_tokens_cached(text: str) -> int:
+    """Token count for a string, memoized across requests.
+
+    System prompts and tool schemas are near-identical between requests from
+    the same client, so repeats become a dict lookup instead of a BPE encode.
+    """
+    return len(ENCODER.encode(text))
+
+
+def _count_stable_text(text: str, pieces: list[str]) -> int:
+    """Count a likely-repeated string via the cache, or defer it to the tail encode."""
+    if len(text) > _CACHE_MAX_CHARS:
+        pieces.append(text)
+        return 0
+    return _count_tokens_cached(text)
+
+
+# Block handlers append the block's text to ``pieces`` for tokenizing and
+# return any tokens not derived from that text (the image estimate). Fixed
+# per-block overhead is added once from block counts after the loop.
+
+
+def _count_text_block(block: Any, pieces: list[str]) -> int:
+    pieces.append(str(_get_block_attr(block, "text", "")))
+    return 0
+
+
+def _count_thinking_block(block: Any, pieces: list[str]) -> int:
+    pieces.append(str(_get_block_attr(block, "thinking", "")))
+    return 0
+
+
+def _count_tool_use_block(block: Any, pieces: list[str]) -> int:
+    pieces.append(str(_get_block_attr(block, "name", "")))
+    pieces.append(_json_text(_get_block_attr(block, "input", {})))
+    pieces.append(str(_get_block_attr(block, "id", "")))
+    return 0
+
+
+def _count_image_block(block: Any, pieces: list[str]) -> int:
+    source = _get_block_attr(block, "source")
+    if isinstance(source, dict):
+        data = source.get("data") or source.get("base64") or ""
+        if data:
+            return max(85, len(data) // 3000)
+    return 765
+
+
+def _count_tool_result_block(block: Any, pieces: list[str]) -> int:
+    content = _get_block_attr(block, "content", "")
+    pieces.append(content if isinstance(content, str) else _json_text(content))
+    pieces.append(str(_get_block_attr(block, "tool_use_id", "")))
+    return 0
+
+
+def _count_unknown_block(block: Any, pieces: list[str]) -> int:
+    logger.debug(
+        f"Unexpected block type {_get_block_attr(block, 'type')!r}, "
+        "falling back to json/str encoding"
+    )
+    try:
+        pieces.append(json.dumps(block))
+    except TypeError, ValueError:
+        pieces.append(str(block))
+    return 0
+
+
+_BLOCK_HANDLERS: dict[str, Callable[[Any, list[str]], int]] = {
+    "text": _count_text_block,
+    "thinking": _count_thinking_block,
+    "tool_use": _count_tool_use_block,
+    "image": _count_image_block,
+    "tool_result": _count_tool_result_block,
+}
+
+
 def get_token_count(
     messages: list,
     system: str | list | None = None,
@@ -30,78 +130,64 @@ def get_token_count(
 
     Uses tiktoken cl100k_base encoding to estimate token usage.
     Includes system prompt, messages, tools, and per-message overhead.
+    System and tool text is counted through an LRU cache; remaining text is
+    collected and tokenized after the block walk.
     """
+    # Fast path: one plain-text message, no tools, and at most a cacheable
+    # string system prompt needs a single encode and no block dispatch.
+    if (
+        len(messages) == 1
+        and not tools
+        and isinstance(messages[0].content, str)
+        and (
+            not system or (isinstance(system, str) and len(system) <= _CACHE_MAX_CHARS)
+        )
+    ):
+        total_tokens = len(ENCODER.encode(messages[0].content)) + 4
+        if system:
+            total_tokens += _count_tokens_cached(system) + 4
+        return max(1, total_tokens)
+
+    pieces: list[str] = []
     total_tokens = 0
+    block_counts: Counter[str] = Counter()
 
     if system:
         if isinstance(system, str):
-            total_tokens += len(ENCODER.encode(system))
+            total_tokens += _count_stable_text(system, pieces)
         elif isinstance(system, list):
             for block in system:
                 text = _get_block_attr(block, "text", "")
                 if text:
-                    total_tokens += len(ENCODER.encode(str(text)))
+                    total_tokens += _count_stable_text(str(text), pieces)
         total_tokens += 4  # System block formatting overhead
 
     for msg in messages:
         if isinstance(msg.content, str):
-            total_tokens += len(ENCODER.encode(msg.content))
+            pieces.append(msg.content)
         elif isinstance(msg.content, list):
             for block in msg.content:
-                b_type = _get_block_attr(block, "type") or None
-
-                if b_type == "text":
-                    text = _get_block_attr(block, "text", "")
-                    total_tokens += len(ENCODER.encode(str(text)))
-                elif b_type == "thinking":
-                    thinking = _get_block_attr(block, "thinking", "")
-                    total_tokens += len(ENCODER.encode(str(thinking)))
-                elif b_type == "tool_use":
-                    name = _get_block_attr(block, "name", "")
-                    inp = _get_block_attr(block, "input", {})
-                    block_id = _get_block_attr(block, "id", "")
-                    total_tokens += len(ENCODER.encode(str(name)))
-                    total_tokens += len(ENCODER.encode(json.dumps(inp)))
-                    total_tokens += len(ENCODER.encode(str(block_id)))
-                    total_tokens += 15
-                elif b_type == "image":
-                    source = _get_block_attr(block, "source")
-                    if isinstance(source, dict):
-                        data = source.get("data") or source.get("base64") or ""
-                        if data:
-                            total_tokens += max(85, len(data) // 3000)
-                        else:
-                            total_tokens += 765
-                    else:
-                        total_tokens += 765
-                elif b_type == "tool_result":
-                    content = _get_block_attr(block, "content", "")
-                    tool_use_id = _get_block_attr(block, "tool_use_id", "")
-                    if isinstance(content, str):
-                        total_tokens += len(ENCODER.encode(content))
-                    else:
-                        total_tokens += len(ENCODER.encode(json.dumps(content)))
-                    total_tokens += len(ENCODER.encode(str(tool_use_id)))
-                    total_tokens += 8
-                else:
-                    logger.debug(
-                        "Unexpected block type %r, falling back to json/str encoding",
-                        b_type,
-                    )
-                    try:
-                        total_tokens += len(ENCODER.encode(json.dumps(block)))
-                    except TypeError, ValueError:
-                        total_tokens += len(ENCODER.encode(str(block)))
+                b_type = _get_block_attr(block, "type")
+                block_counts[b_type] += 1
+                handler = _BLOCK_HANDLERS.get(b_type, _count_unknown_block)
+                total_tokens += handler(block, pieces)
 
     if tools:
         for tool in tools:
             tool_str = (
                 tool.name + (tool.description or "") + json.dumps(tool.input_schema)
             )
-            total_tokens += len(ENCODER.encode(tool_str))
-
-    total_tokens += len(messages) * 4
+            total_tokens += _count_stable_text(tool_str, pieces)
+
+    # Formatting overhead: per message, per tool_use/tool_result block, per tool
+    total_tokens += (
+        4 * len(messages)
+        + 15 * block_counts["tool_use"]
+        + 8 * block_counts["tool_result"]
+    )
     if tools:
-        total_tokens += len(tools) * 5
+        total_tokens += 5 * len(tools)
+
+    total_tokens += sum(len(ENCODER.encode(piece)) for piece in pieces)
 
     return max(1, total_tokens)
@@ -1,7 +1,8 @@
 """FastAPI route handlers."""
 
+import asyncio
 import json
-import uuid
+import secrets
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
@@ -17,6 +18,7 @@ from .models.anthropic import MessagesRequest, TokenCountRequest
 from .models.responses import TokenCountResponse
 from .optimization_handlers import try_optimizations
 from .request_utils import get_token_count
+from .streaming import coalesce_sse_events
 
 router = APIRouter()
 
@@ -43,18 +45,24 @@ async def create_message(
         if optimized is not None:
             return optimized
 
-        request_id = f"req_{uuid.uuid4().hex[:12]}"
+        request_id = f"req_{secrets.token_hex(6)}"
         log_request_compact(logger, request_id, request_data)
 
-        input_tokens = get_token_count(
-            request_data.messages, request_data.system, request_data.tools
+        input_tokens = await asyncio.to_thread(
+            get_token_count,
+            request_data.messages,
+            request_data.system,
+            request_data.tools,
         )
+        stream = provider.stream_response(
+            request_data,
+            input_tokens=input_tokens,
+            request_id=request_id,
+        )
+        if settings.sse_coalesce_bytes > 0:
+            stream = coalesce_sse_events(stream, max_bytes=settings.sse_coalesce_bytes)
         return StreamingResponse(
-            provider.stream_response(
-                request_data,
-                input_tokens=input_tokens,
-                request_id=request_id,
-            ),
+            stream,
             media_type="text/event-stream",
             headers={
                 "X-Accel-Buffering": "no",
@@ -66,9 +74,7 @@ async def create_message(
     except ProviderError:
         raise
     except Exception as e:
-        import traceback
-
-        logger.error(f"Error: {e!s}\n{traceback.format_exc()}")
+        logger.exception(f"Error: {e!s}")
         raise HTTPException(
             status_code=getattr(e, "status_code", 500), detail=str(e)
         ) from e
@@ -77,26 +83,22 @@ async def create_message(
 @router.post("/v1/messages/count_tokens")
 async def count_tokens(request_data: TokenCountRequest):
     """Count tokens for a request."""
-    request_id = f"req_{uuid.uuid4().hex[:12]}"
+    request_id = f"req_{secrets.token_hex(6)}"
     with logger.contextualize(request_id=request_id):
         try:
-            tokens = get_token_count(
-                request_data.messages, request_data.system, request_data.tools
+            tokens = await asyncio.to_thread(
+                get_token_count,
+                request_data.messages,
+                request_data.system,
+                request_data.tools,
             )
             summary = build_request_summary(request_data)
             summary["request_id"] = request_id
             summary["input_tokens"] = tokens
-            logger.info("COUNT_TOKENS: %s", json.dumps(summary))
+            logger.info(f"COUNT_TOKENS: {json.dumps(summary)}")
             return TokenCountResponse(input_tokens=tokens)
         except Exception as e:
-            import traceback
-
-            logger.error(
-                "COUNT_TOKENS_ERROR: request_id=%s error=%s\n%s",
-                request_id,
-                str(e),
-                traceback.format_exc(),
-            )
+            logger.exception(f"COUNT_TOKENS_ERROR: request_id={request_id} error={e!s}")
             raise HTTPException(status_code=500, detail=str(e)) from e
 
 
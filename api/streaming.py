@@ -0,0 +1,98 @@
+"""SSE stream coalescing for high-rate provider streams.
+
+Providers emit one SSE event per upstream token. Coalescing bursts of
+content_block_delta events into a single chunk keeps the bytes identical
+while cutting the number of transport writes.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator, AsyncIterator
+
+_DELTA_EVENT_PREFIX = "event: content_block_delta"
+
+# Max time a buffered delta waits for company before it is flushed
+COALESCE_MAX_DELAY_S = 0.01
+
+# Bound on events read ahead from the provider while the client catches up
+_QUEUE_SIZE = 256
+
+
+async def coalesce_sse_events(
+    source: AsyncIterator[str],
+    max_bytes: int = 4096,
+    max_delay: float = COALESCE_MAX_DELAY_S,
+) -> AsyncIterator[str]:
+    """Merge consecutive content_block_delta events into fewer chunks.
+
+    Each SSE event is passed through intact; deltas are concatenated until
+    ``max_bytes`` are buffered or ``max_delay`` seconds pass since the first
+    buffered delta. Any other event flushes the buffer and is yielded on its
+    own, so message_start, content_block_stop, etc. are never held back.
+    """
+    loop = asyncio.get_running_loop()
+    # str = event, BaseException = source failure, None = source exhausted
+    queue: asyncio.Queue[str | BaseException | None] = asyncio.Queue(
+        maxsize=_QUEUE_SIZE
+    )
+
+    async def pump() -> None:
+        # Reading in a separate task lets the consumer time out on queue.get()
+        # without cancelling the provider's in-flight read.
+        try:
+            async for event in source:
+                await queue.put(event)
+            await queue.put(None)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            # Close promptly so the provider releases its concurrency slot
+            # even when the client disconnects mid-stream.
+            if isinstance(source, AsyncGenerator):
+                await source.aclose()
+
+    pump_task = asyncio.create_task(pump())
+    buffer: list[str] = []
+    buffered_bytes = 0
+    deadline = 0.0
+
+    try:
+        while True:
+            if buffer:
+                try:
+                    item = await asyncio.wait_for(
+                        queue.get(), timeout=max(0.0, deadline - loop.time())
+                    )
+                except TimeoutError:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    buffered_bytes = 0
+                    continue
+            else:
+                item = await queue.get()
+
+            if isinstance(item, str) and item.startswith(_DELTA_EVENT_PREFIX):
+                if not buffer:
+                    deadline = loop.time() + max_delay
+                buffer.append(item)
+                buffered_bytes += len(item)
+                if buffered_bytes >= max_bytes:
+                    yield "".join(buffer)
+                    buffer.clear()
+                    buffered_bytes = 0
+                continue
+
+            if buffer:
+                yield "".join(buffer)
+                buffer.clear()
+                buffered_bytes = 0
+
+            if item is None:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        pump_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await pump_task
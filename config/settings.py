@@ -60,6 +60,10 @@ class Settings(BaseSettings):
         default=2.0, validation_alias="HTTP_CONNECT_TIMEOUT"
     )
 
+    # ==================== SSE Streaming ====================
+    # Max bytes of content_block_delta events merged into one write (0 = off)
+    sse_coalesce_bytes: int = Field(default=4096, validation_alias="SSE_COALESCE_BYTES")
+
     # ==================== Fast Prefix Detection ====================
     fast_prefix_detection: bool = True
 
@@ -82,6 +86,10 @@ class Settings(BaseSettings):
     whisper_model: str = Field(default="base", validation_alias="WHISPER_MODEL")
     # Device: "cpu" | "cuda"
     whisper_device: str = Field(default="cpu", validation_alias="WHISPER_DEVICE")
+    # Reuse transcripts of byte-identical voice notes (forwards, retries)
+    transcription_cache_enabled: bool = Field(
+        default=True, validation_alias="TRANSCRIPTION_CACHE_ENABLED"
+    )
 
     # ==================== Bot Wrapper Config ====================
     telegram_bot_token: str | None = None
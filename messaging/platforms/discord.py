@@ -212,6 +212,7 @@ class DiscordPlatform(MessagingPlatform):
                 ct,
                 whisper_model=settings.whisper_model,
                 whisper_device=settings.whisper_device,
+                use_cache=settings.transcription_cache_enabled,
             )
 
             if not await self._is_voice_still_pending(channel_id, message_id):
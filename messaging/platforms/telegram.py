@@ -615,6 +615,7 @@ class TelegramPlatform(MessagingPlatform):
                 voice.mime_type or "audio/ogg",
                 whisper_model=settings.whisper_model,
                 whisper_device=settings.whisper_device,
+                use_cache=settings.transcription_cache_enabled,
             )
 
             if not await self._is_voice_still_pending(chat_id, message_id):
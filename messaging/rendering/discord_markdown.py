@@ -11,6 +11,10 @@ from markdown_it import MarkdownIt
 # Discord escapes: \ * _ ` ~ | >
 DISCORD_SPECIAL = set("\\*_`~|>")
 
+# str.translate tables: escape in a single C-level pass over the text
+_DISCORD_TABLE = str.maketrans({ch: f"\\{ch}" for ch in DISCORD_SPECIAL})
+_DISCORD_CODE_TABLE = str.maketrans({"\\": "\\\\", "`": "\\`"})
+
 _MD = MarkdownIt("commonmark", {"html": False, "breaks": False})
 _MD.enable("strikethrough")
 _MD.enable("table")
@@ -65,12 +69,12 @@ def _normalize_gfm_tables(text: str) -> str:
 
 def escape_discord(text: str) -> str:
     """Escape text for Discord markdown (bold, italic, etc.)."""
-    return "".join(f"\\{ch}" if ch in DISCORD_SPECIAL else ch for ch in text)
+    return text.translate(_DISCORD_TABLE)
 
 
 def escape_discord_code(text: str) -> str:
     """Escape text for Discord code spans/blocks."""
-    return text.replace("\\", "\\\\").replace("`", "\\`")
+    return text.translate(_DISCORD_CODE_TABLE)
 
 
 def discord_bold(text: str) -> str:
@@ -11,6 +11,11 @@ from markdown_it import MarkdownIt
 MDV2_SPECIAL_CHARS = set("\\_*[]()~`>#+-=|{}.!")
 MDV2_LINK_ESCAPE = set("\\)")
 
+# str.translate tables: escape in a single C-level pass over the text
+_MDV2_TABLE = str.maketrans({ch: f"\\{ch}" for ch in MDV2_SPECIAL_CHARS})
+_MDV2_LINK_TABLE = str.maketrans({ch: f"\\{ch}" for ch in MDV2_LINK_ESCAPE})
+_MDV2_CODE_TABLE = str.maketrans({"\\": "\\\\", "`": "\\`"})
+
 _MD = MarkdownIt("commonmark", {"html": False, "breaks": False})
 _MD.enable("strikethrough")
 _MD.enable("table")
@@ -71,17 +76,17 @@ def _normalize_gfm_tables(text: str) -> str:
 
 def escape_md_v2(text: str) -> str:
     """Escape text for Telegram MarkdownV2."""
-    return "".join(f"\\{ch}" if ch in MDV2_SPECIAL_CHARS else ch for ch in text)
+    return text.translate(_MDV2_TABLE)
 
 
 def escape_md_v2_code(text: str) -> str:
     """Escape text for Telegram MarkdownV2 code spans/blocks."""
-    return text.replace("\\", "\\\\").replace("`", "\\`")
+    return text.translate(_MDV2_CODE_TABLE)
 
 
 def escape_md_v2_link_url(text: str) -> str:
     """Escape URL for Telegram MarkdownV2 link destination."""
-    return "".join(f"\\{ch}" if ch in MDV2_LINK_ESCAPE else ch for ch in text)
+    return text.translate(_MDV2_LINK_TABLE)
 
 
 def mdv2_bold(text: str) -> str:
@@ -4,7 +4,11 @@ Uses Hugging Face transformers Whisper pipeline for free, offline transcription.
 CUDA 13 compatible.
 """
 
+import gc
+import hashlib
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
@@ -13,6 +17,9 @@ from loguru import logger
 # Max file size in bytes (25 MB)
 MAX_AUDIO_SIZE_BYTES = 25 * 1024 * 1024
 
+# Whisper expects 16 kHz sample rate
+_WHISPER_SAMPLE_RATE = 16000
+
 # Short model names -> full Hugging Face model IDs
 _MODEL_MAP: dict[str, str] = {
     "tiny": "openai/whisper-tiny",
@@ -24,8 +31,15 @@ _MODEL_MAP: dict[str, str] = {
     "large-v3-turbo": "openai/whisper-large-v3-turbo",
 }
 
-# Lazy-loaded pipelines: (model_id, device) -> pipeline
+# Lazy-loaded pipeline: (model_id, device) -> pipeline. Holds at most one
+# entry; switching model or device evicts the old pipeline (one-time reload).
 _pipeline_cache: dict[tuple[str, str], Any] = {}
+_pipeline_lock = threading.Lock()
+
+# Recent transcripts: (audio hash, model_id, device) -> text, FIFO-evicted
+_TRANSCRIPT_CACHE_MAX_ENTRIES = 256
+_transcript_cache: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+_transcript_cache_lock = threading.Lock()
 
 
 def _resolve_model_id(whisper_model: str) -> str:
@@ -35,50 +49,111 @@ def _resolve_model_id(whisper_model: str) -> str:
 
 def _get_pipeline(model_id: str, device: str) -> Any:
     """Lazy-load transformers Whisper pipeline. Raises ImportError if not installed."""
-    global _pipeline_cache
     if device not in ("cpu", "cuda"):
         raise ValueError(f"whisper_device must be 'cpu' or 'cuda', got {device!r}")
     cache_key = (model_id, device)
-    if cache_key not in _pipeline_cache:
-        try:
-            import torch
-            from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
-
-            from config.settings import get_settings
-
-            token = get_settings().hf_token
-            if token:
-                os.environ["HF_TOKEN"] = token
-
-            use_cuda = device == "cuda" and torch.cuda.is_available()
-            pipe_device = "cuda:0" if use_cuda else "cpu"
-            model_dtype = torch.float16 if use_cuda else torch.float32
-
-            model = AutoModelForSpeechSeq2Seq.from_pretrained(
-                model_id,
-                dtype=model_dtype,
-                low_cpu_mem_usage=True,
-                attn_implementation="sdpa",
-            )
-            model = model.to(pipe_device)
-            processor = AutoProcessor.from_pretrained(model_id)
-
-            pipe = pipeline(
-                "automatic-speech-recognition",
-                model=model,
-                tokenizer=processor.tokenizer,
-                feature_extractor=processor.feature_extractor,
-                device=pipe_device,
-            )
-            _pipeline_cache[cache_key] = pipe
-            logger.debug(
-                f"Loaded Whisper pipeline: model={model_id} device={pipe_device}"
+    # Held while loading so a voice note arriving during preload waits for it
+    # instead of loading a second copy.
+    with _pipeline_lock:
+        if cache_key not in _pipeline_cache:
+            _pipeline_cache[cache_key] = _load_pipeline(model_id, device)
+        return _pipeline_cache[cache_key]
+
+
+def _load_pipeline(model_id: str, device: str) -> Any:
+    """Build a Whisper pipeline, evicting any previously cached one first."""
+    try:
+        import torch
+        from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
+
+        from config.settings import get_settings
+
+        token = get_settings().hf_token
+        if token:
+            os.environ["HF_TOKEN"] = token
+
+        use_cuda = device == "cuda" and torch.cuda.is_available()
+        pipe_device = "cuda:0" if use_cuda else "cpu"
+        model_dtype = torch.float16 if use_cuda else torch.float32
+
+        _evict_pipelines(torch)
+        model = AutoModelForSpeechSeq2Seq.from_pretrained(
+            model_id,
+            dtype=model_dtype,
+            low_cpu_mem_usage=True,
+            attn_implementation="sdpa",
+        )
+        model = model.to(pipe_device)
+        if use_cuda:
+            # The pipeline calls model.generate, which bypasses a compiled
+            # module, so compile the decoder step itself. A static KV cache
+            # keeps its shapes fixed; otherwise CUDA graphs recompile as
+            # the cache grows.
+            model.generation_config.cache_implementation = "static"
+            model.forward = torch.compile(model.forward, mode="reduce-overhead")
+        processor = AutoProcessor.from_pretrained(model_id)
+
+        pipe = pipeline(
+            "automatic-speech-recognition",
+            model=model,
+            tokenizer=processor.tokenizer,
+            feature_extractor=processor.feature_extractor,
+            device=pipe_device,
+            dtype=model_dtype,
+            chunk_length_s=30,
+            # Compiled decoding captures a CUDA graph per batch shape, so keep
+            # one shape on CUDA; CPU batches up to 8 chunks.
+            batch_size=1 if use_cuda else 8,
+        )
+        if use_cuda:
+            # Compile and capture the CUDA graph on 1s of silence. This runs in
+            # preload_pipeline at startup, or else in the first voice note.
+            silence = torch.zeros(_WHISPER_SAMPLE_RATE, dtype=torch.float32)
+            pipe(
+                {"array": silence.numpy(), "sampling_rate": _WHISPER_SAMPLE_RATE},
+                generate_kwargs={"language": "en", "task": "transcribe"},
             )
-        except ImportError as e:
-            raise ImportError(
-                "Voice notes require the voice extra. Install with: uv sync --extra voice"
-            ) from e
-    return _pipeline_cache[cache_key]
+        logger.debug(f"Loaded Whisper pipeline: model={model_id} device={pipe_device}")
+        return pipe
+    except ImportError as e:
+        raise ImportError(
+            "Voice notes require the voice extra. Install with: uv sync --extra voice"
+        ) from e
+
+
+def preload_pipeline(whisper_model: str, whisper_device: str) -> None:
+    """Load the pipeline ahead of the first voice note.
+
+    On CUDA this includes compilation and CUDA graph capture. Blocking; run it
+    in a background thread at startup. Failures are logged, and the first voice
+    note retries the load.
+    """
+    try:
+        _get_pipeline(_resolve_model_id(whisper_model), whisper_device)
+    except Exception as e:
+        logger.warning(f"Whisper preload failed: {type(e).__name__}: {e}")
+
+
+def _evict_pipelines(torch: Any) -> None:
+    """Drop cached pipelines and return their GPU memory to the allocator."""
+    if not _pipeline_cache:
+        return
+    # CUDA pipelines are the ones _load_pipeline compiled
+    compiled = torch.cuda.is_available() and any(
+        device == "cuda" for _, device in _pipeline_cache
+    )
+    for pipe in _pipeline_cache.values():
+        pipe.model.to("cpu")
+    _pipeline_cache.clear()
+    if compiled:
+        # Dynamo caches and CUDA graph pools are process-global: without a
+        # reset they keep their memory, and every reload of the shared forward
+        # code counts toward the recompile limit.
+        torch.compiler.reset()
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+    logger.debug("Evicted cached Whisper pipeline")
 
 
 def transcribe_audio(
@@ -87,6 +162,7 @@ def transcribe_audio(
     *,
     whisper_model: str = "base",
     whisper_device: str = "cpu",
+    use_cache: bool = False,
 ) -> str:
     """
     Transcribe audio file to text using Hugging Face transformers Whisper.
@@ -96,6 +172,7 @@ def transcribe_audio(
         mime_type: MIME type of the audio (e.g. "audio/ogg")
         whisper_model: Model ID (e.g. "openai/whisper-base") or short name
         whisper_device: "cpu" | "cuda"
+        use_cache: Reuse the transcript of byte-identical audio seen recently
 
     Returns:
         Transcribed text
@@ -114,11 +191,31 @@ def transcribe_audio(
             f"Audio file too large ({size} bytes). Max {MAX_AUDIO_SIZE_BYTES} bytes."
         )
 
-    return _transcribe_local(file_path, whisper_model, whisper_device)
-
-
-# Whisper expects 16 kHz sample rate
-_WHISPER_SAMPLE_RATE = 16000
+    if not use_cache:
+        return _transcribe_local(file_path, whisper_model, whisper_device)
+
+    key = (
+        _hash_audio_file(file_path),
+        _resolve_model_id(whisper_model),
+        whisper_device,
+    )
+    with _transcript_cache_lock:
+        cached = _transcript_cache.get(key)
+    if cached is not None:
+        logger.debug("Transcript cache hit")
+        return cached
+
+    text = _transcribe_local(file_path, whisper_model, whisper_device)
+    with _transcript_cache_lock:
+        _transcript_cache[key] = text
+        while len(_transcript_cache) > _TRANSCRIPT_CACHE_MAX_ENTRIES:
+            _transcript_cache.popitem(last=False)
+    return text
+
+
+def _hash_audio_file(file_path: Path) -> str:
+    """Content hash of an audio file for transcript caching (not cryptographic use)."""
+    return hashlib.blake2b(file_path.read_bytes(), digest_size=16).hexdigest()
 
 
 def _load_audio(file_path: Path) -> dict[str, Any]:
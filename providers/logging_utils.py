@@ -97,15 +97,6 @@ def build_request_summary(request_data: Any) -> dict[str, Any]:
     }
 
 
-def log_full_payload(
-    logger_instance: Any, request_id: str, payload: dict[str, Any]
-) -> None:
-    """Log full payload to the standard logger."""
-    logger_instance.debug(
-        f"FULL_PAYLOAD [{request_id}]: {json.dumps(payload, default=str)}"
-    )
-
-
 def log_request_compact(
     logger_instance: Any,
     request_id: str,
@@ -122,11 +113,14 @@ def log_request_compact(
 
     logger_instance.info(f"{prefix}: {json.dumps(summary)}")
 
-    # Always log full payload
+    # Always log full payload. Pydantic's Rust serializer skips the
+    # model_dump() + json.dumps() round trip on this per-request path.
     try:
-        payload = (
-            request_data.model_dump() if hasattr(request_data, "model_dump") else {}
+        payload_json = (
+            request_data.model_dump_json()
+            if hasattr(request_data, "model_dump_json")
+            else "{}"
         )
-        log_full_payload(logger_instance, request_id, payload)
+        logger_instance.debug(f"FULL_PAYLOAD [{request_id}]: {payload_json}")
     except Exception as e:
         logger.debug(f"Could not dump request data: {e}")
@@ -58,6 +58,18 @@ def test_create_message_stream():
     assert b"message_start" in content or b"event:" in content
 
 
+def test_create_message_stream_disables_buffering():
+    """Streaming response opts out of proxy buffering."""
+    payload = {
+        "model": "claude-3-sonnet",
+        "messages": [{"role": "user", "content": "Hi"}],
+        "max_tokens": 100,
+        "stream": True,
+    }
+    response = client.post("/v1/messages", json=payload)
+    assert response.headers.get("x-accel-buffering") == "no"
+
+
 def test_model_mapping():
     # Test Haiku mapping
     _stream_response_calls.clear()
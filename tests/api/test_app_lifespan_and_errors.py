@@ -1,4 +1,5 @@
 import importlib
+import threading
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -28,6 +29,9 @@ def test_create_app_provider_error_handler_returns_anthropic_format():
         host="127.0.0.1",
         port=8082,
         log_file="server.log",
+        voice_note_enabled=True,
+        whisper_model="base",
+        whisper_device="cpu",
     )
     with (
         patch.object(api_app_mod, "get_settings", return_value=settings),
@@ -62,6 +66,9 @@ def test_create_app_general_exception_handler_returns_500():
         host="127.0.0.1",
         port=8082,
         log_file="server.log",
+        voice_note_enabled=True,
+        whisper_model="base",
+        whisper_device="cpu",
     )
     with (
         patch.object(api_app_mod, "get_settings", return_value=settings),
@@ -94,6 +101,9 @@ def test_app_lifespan_sets_state_and_cleans_up(tmp_path, messaging_enabled):
         host="127.0.0.1",
         port=8082,
         log_file=str(tmp_path / "server.log"),
+        voice_note_enabled=True,
+        whisper_model="base",
+        whisper_device="cpu",
     )
 
     fake_platform = MagicMock()
@@ -173,6 +183,9 @@ def test_app_lifespan_cleanup_continues_if_platform_stop_raises(tmp_path):
         host="127.0.0.1",
         port=8082,
         log_file=str(tmp_path / "server.log"),
+        voice_note_enabled=True,
+        whisper_model="base",
+        whisper_device="cpu",
     )
 
     fake_platform = MagicMock()
@@ -226,6 +239,9 @@ def test_app_lifespan_messaging_import_error_no_crash(tmp_path, caplog):
         host="127.0.0.1",
         port=8082,
         log_file=str(tmp_path / "server.log"),
+        voice_note_enabled=True,
+        whisper_model="base",
+        whisper_device="cpu",
     )
 
     api_app_mod = importlib.import_module("api.app")
@@ -262,6 +278,9 @@ def test_app_lifespan_platform_start_exception_cleanup_still_runs(tmp_path):
         host="127.0.0.1",
         port=8082,
         log_file=str(tmp_path / "server.log"),
+        voice_note_enabled=True,
+        whisper_model="base",
+        whisper_device="cpu",
     )
 
     fake_platform = MagicMock()
@@ -313,6 +332,9 @@ def test_app_lifespan_flush_pending_save_exception_warning_only(tmp_path):
         host="127.0.0.1",
         port=8082,
         log_file=str(tmp_path / "server.log"),
+        voice_note_enabled=True,
+        whisper_model="base",
+        whisper_device="cpu",
     )
 
     fake_platform = MagicMock()
@@ -347,3 +369,93 @@ def test_app_lifespan_flush_pending_save_exception_warning_only(tmp_path):
 
     session_store.flush_pending_save.assert_called_once()
     cleanup_provider.assert_awaited_once()
+
+
+def test_app_lifespan_warms_up_encoder():
+    from api.app import create_app
+
+    app = create_app()
+
+    api_app_mod = importlib.import_module("api.app")
+    settings = SimpleNamespace(
+        messaging_platform="telegram",
+        telegram_bot_token=None,
+        allowed_telegram_user_id=None,
+        discord_bot_token=None,
+        allowed_discord_channels=None,
+        allowed_dir="",
+        claude_workspace="./agent_workspace",
+        host="127.0.0.1",
+        port=8082,
+        log_file="server.log",
+        voice_note_enabled=True,
+        whisper_model="base",
+        whisper_device="cpu",
+    )
+    with (
+        patch.object(api_app_mod, "get_settings", return_value=settings),
+        patch.object(api_app_mod, "cleanup_provider", new=AsyncMock()),
+        patch.object(api_app_mod, "warm_up_encoder") as warm_up,
+        TestClient(app),
+    ):
+        warm_up.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("whisper_device", "expect_preload"), [("cuda", True), ("cpu", False)]
+)
+def test_app_lifespan_preloads_cuda_whisper_in_background(
+    tmp_path, whisper_device, expect_preload
+):
+    from api.app import create_app
+
+    app = create_app()
+
+    settings = SimpleNamespace(
+        messaging_platform="telegram",
+        telegram_bot_token="token",
+        allowed_telegram_user_id="123",
+        discord_bot_token=None,
+        allowed_discord_channels=None,
+        allowed_dir=str(tmp_path / "workspace"),
+        claude_workspace=str(tmp_path / "data"),
+        host="127.0.0.1",
+        port=8082,
+        log_file=str(tmp_path / "server.log"),
+        voice_note_enabled=True,
+        whisper_model="base",
+        whisper_device=whisper_device,
+    )
+
+    fake_platform = MagicMock()
+    fake_platform.name = "fake"
+    fake_platform.start = AsyncMock()
+    fake_platform.stop = AsyncMock()
+
+    session_store = MagicMock()
+    session_store.get_all_trees.return_value = []
+
+    cli_manager = MagicMock()
+    cli_manager.stop_all = AsyncMock()
+
+    api_app_mod = importlib.import_module("api.app")
+    with (
+        patch.object(api_app_mod, "get_settings", return_value=settings),
+        patch.object(api_app_mod, "cleanup_provider", new=AsyncMock()),
+        patch(
+            "messaging.factory.create_messaging_platform",
+            return_value=fake_platform,
+        ),
+        patch("messaging.session.SessionStore", return_value=session_store),
+        patch("cli.manager.CLISessionManager", return_value=cli_manager),
+        patch("messaging.transcription.preload_pipeline") as preload,
+        TestClient(app),
+    ):
+        for thread in threading.enumerate():
+            if thread.name == "whisper-preload":
+                thread.join(timeout=5)
+
+    if expect_preload:
+        preload.assert_called_once_with("base", "cuda")
+    else:
+        preload.assert_not_called()
@@ -6,10 +6,10 @@ from api.detection import (
     is_filepath_extraction_request,
     is_prefix_detection_request,
 )
-from api.models.anthropic import Message, MessagesRequest
+from api.models.anthropic import ContentBlockText, Message, MessagesRequest
 
 
-def _make_request(content: str, **kwargs) -> MessagesRequest:
+def _make_request(content: str | list, **kwargs) -> MessagesRequest:
     return MessagesRequest(
         model="claude-3-sonnet",
         max_tokens=100,
@@ -51,6 +51,33 @@ class TestIsPrefixDetectionRequest:
         assert is_req is False
         assert cmd == ""
 
+    def test_list_content_without_policy_spec_skips_join(self):
+        """List content with no <policy_spec> block returns early without joining."""
+        req = _make_request(
+            [
+                ContentBlockText(type="text", text="x" * 10000),
+                ContentBlockText(type="text", text="Command: ls"),
+            ]
+        )
+        with patch("api.detection.extract_text_from_content") as mock_extract:
+            is_req, cmd = is_prefix_detection_request(req)
+        mock_extract.assert_not_called()
+        assert is_req is False
+        assert cmd == ""
+
+    def test_list_content_ignores_blocks_before_policy_spec(self):
+        """Command is read from the policy block onward."""
+        req = _make_request(
+            [
+                ContentBlockText(type="text", text="earlier context"),
+                ContentBlockText(type="text", text="<policy_spec>rules</policy_spec>"),
+                ContentBlockText(type="text", text=" Command: npm test"),
+            ]
+        )
+        is_req, cmd = is_prefix_detection_request(req)
+        assert is_req is True
+        assert cmd == "npm test"
+
 
 class TestIsFilepathExtractionRequest:
     def test_output_marker_minus_one_returns_false(self):
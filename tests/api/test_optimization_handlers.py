@@ -1,5 +1,6 @@
 """Tests for api/optimization_handlers.py."""
 
+import re
 from unittest.mock import patch
 
 from api.models.anthropic import ContentBlockText, Message, MessagesRequest
@@ -55,6 +56,7 @@ class TestTryPrefixDetection:
         block = result.content[0]
         assert isinstance(block, ContentBlockText)
         assert block.text == "/ask"
+        assert re.fullmatch(r"msg_[0-9a-f]{32}", result.id)
 
     def test_enabled_but_no_match_returns_none(self):
         settings = Settings()
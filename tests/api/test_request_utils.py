@@ -1,6 +1,6 @@
 """Tests for api/request_utils.py module."""
 
-from unittest.mock import MagicMock
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
@@ -548,6 +548,197 @@ class TestGetTokenCount:
         count = get_token_count([msg], system=system_text)
         assert count >= expected_min, f"count={count} < expected_min={expected_min}"
 
+    def test_count_matches_per_piece_encoding(self):
+        """Total equals summing per-piece encodes plus overhead."""
+        import tiktoken
+
+        enc = tiktoken.get_encoding("cl100k_base")
+        text_block = {"type": "text", "text": "Hello there"}
+        thinking_block = {"type": "thinking", "thinking": "Considering options"}
+        msg = MagicMock()
+        msg.content = [text_block, thinking_block]
+
+        expected = (
+            len(enc.encode("Be concise"))
+            + len(enc.encode("Hello there"))
+            + len(enc.encode("Considering options"))
+            + 4  # system overhead
+            + 4  # per-message overhead
+        )
+        assert get_token_count([msg], system="Be concise") == expected
+
+    def test_system_and_tools_counted_via_cache(self):
+        """Repeated system prompts and tool schemas hit the token-count cache."""
+        from api.request_utils import _count_tokens_cached
+
+        msg = MagicMock()
+        msg.content = "Hi"
+        tool = MagicMock()
+        tool.name = "search"
+        tool.description = "Search the web"
+        tool.input_schema = {"type": "object"}
+
+        _count_tokens_cached.cache_clear()
+        first = get_token_count([msg], system="You are helpful", tools=[tool])
+        second = get_token_count([msg], system="You are helpful", tools=[tool])
+
+        assert first == second
+        info = _count_tokens_cached.cache_info()
+        assert info.misses == 2
+        assert info.hits == 2
+
+    def test_oversized_system_bypasses_cache(self):
+        """Strings above the cache size limit are not memoized."""
+        from api.request_utils import _CACHE_MAX_CHARS, _count_tokens_cached
+
+        msg = MagicMock()
+        msg.content = "Hi"
+        big_system = "a " * (_CACHE_MAX_CHARS // 2 + 1)
+
+        _count_tokens_cached.cache_clear()
+        count = get_token_count([msg], system=big_system)
+
+        assert count > _CACHE_MAX_CHARS // 4
+        assert _count_tokens_cached.cache_info().currsize == 0
+
+    def test_warm_up_encoder_encodes_once(self):
+        """warm_up_encoder runs a single encode."""
+        from api import request_utils
+
+        with patch.object(request_utils.ENCODER, "encode") as mock_encode:
+            request_utils.warm_up_encoder()
+
+        mock_encode.assert_called_once_with("warmup")
+
+    def test_small_tool_input_skips_json_serialization(self):
+        """Small tool inputs are tokenized from keys and values, not JSON."""
+        import tiktoken
+
+        enc = tiktoken.get_encoding("cl100k_base")
+        tool_block = {
+            "type": "tool_use",
+            "id": "call_1",
+            "name": "search",
+            "input": {"query": "weather"},
+        }
+        msg = MagicMock()
+        msg.content = [tool_block]
+
+        with patch("api.request_utils.json.dumps") as mock_dumps:
+            count = get_token_count([msg])
+
+        mock_dumps.assert_not_called()
+        expected = (
+            len(enc.encode("search"))
+            + len(enc.encode("queryweather"))
+            + len(enc.encode("call_1"))
+            + 15  # tool_use overhead
+            + 4  # per-message overhead
+        )
+        assert count == expected
+
+    def test_large_tool_input_uses_json(self):
+        """Tool inputs with more than three keys are serialized as JSON."""
+        tool_block = {
+            "type": "tool_use",
+            "id": "call_1",
+            "name": "edit",
+            "input": {"a": 1, "b": 2, "c": 3, "d": 4},
+        }
+        msg = MagicMock()
+        msg.content = [tool_block]
+
+        with patch("api.request_utils.json.dumps", return_value="{}") as mock_dumps:
+            get_token_count([msg])
+
+        mock_dumps.assert_called_once_with({"a": 1, "b": 2, "c": 3, "d": 4})
+
+    def test_tool_block_overheads_scale_with_block_count(self):
+        """Each tool_use adds 15 and each tool_result adds 8 overhead tokens."""
+        tool_use = {"type": "tool_use", "id": "", "name": "", "input": {}}
+        tool_result = {"type": "tool_result", "tool_use_id": "", "content": ""}
+
+        one = MagicMock()
+        one.content = [tool_use, tool_result]
+        three = MagicMock()
+        three.content = [tool_use, tool_use, tool_use, tool_result, tool_result]
+
+        assert get_token_count([one]) == 4 + 15 + 8
+        assert get_token_count([three]) == 4 + 3 * 15 + 2 * 8
+
+    def test_single_text_message_fast_path(self):
+        """A lone string message without tools is counted with one encode."""
+        import tiktoken
+
+        from api import request_utils
+
+        enc = tiktoken.get_encoding("cl100k_base")
+        msg = MagicMock()
+        msg.content = "Summarize this file"
+
+        with patch.object(
+            request_utils, "_count_stable_text", wraps=request_utils._count_stable_text
+        ) as mock_stable:
+            no_system = get_token_count([msg])
+            with_system = get_token_count([msg], system="Be brief")
+
+        mock_stable.assert_not_called()
+        assert no_system == len(enc.encode("Summarize this file")) + 4
+        assert with_system == no_system + len(enc.encode("Be brief")) + 4
+
+    def test_fast_path_not_used_with_system_blocks(self):
+        """List-form system prompts take the general path."""
+        from api import request_utils
+
+        msg = MagicMock()
+        msg.content = "Hi"
+
+        with patch.object(
+            request_utils, "_count_stable_text", wraps=request_utils._count_stable_text
+        ) as mock_stable:
+            get_token_count([msg], system=[{"type": "text", "text": "sys"}])
+
+        mock_stable.assert_called_once_with("sys", ANY)
+
+    def test_block_handlers_cover_known_types(self):
+        """Known block types dispatch through the handler table."""
+        from api import request_utils
+
+        assert set(request_utils._BLOCK_HANDLERS) == {
+            "text",
+            "thinking",
+            "tool_use",
+            "image",
+            "tool_result",
+        }
+
+    def test_tool_block_handlers_leave_overhead_to_tail(self):
+        """Tool handlers add no fixed overhead; the tail sums it from counts."""
+        from api import request_utils
+
+        pieces: list[str] = []
+        tool_use = {"type": "tool_use", "id": "t1", "name": "run", "input": {}}
+        tool_result = {"type": "tool_result", "tool_use_id": "t1", "content": "ok"}
+
+        assert request_utils._count_tool_use_block(tool_use, pieces) == 0
+        assert request_utils._count_tool_result_block(tool_result, pieces) == 0
+        assert pieces == ["run", "", "t1", "ok", "t1"]
+
+    def test_unknown_block_uses_json_fallback(self):
+        """Block types missing from the handler table are json-encoded."""
+        from api import request_utils
+
+        block = {"type": "custom", "spec": "data"}
+        msg = MagicMock()
+        msg.content = [block]
+
+        with patch.object(
+            request_utils.ENCODER, "encode", wraps=request_utils.ENCODER.encode
+        ) as mock_encode:
+            get_token_count([msg])
+
+        mock_encode.assert_called_once_with('{"type": "custom", "spec": "data"}')
+
 
 # --- Parametrized Edge Case Tests ---
 
@@ -595,14 +786,23 @@ def test_extract_command_prefix_parametrized(command, expected):
 
 
 def test_extract_command_prefix_unterminated_quote():
-    """Unterminated quote falls back to simple split (shlex.split ValueError)."""
+    """Unterminated quote does not matter to whitespace tokenization."""
     result = extract_command_prefix("git commit -m 'unterminated")
-    # Should fall back to command.split()[0] = "git"
-    assert result == "git"
+    assert result == "git commit"
+
+
+def test_extract_command_prefix_env_only():
+    """Only env assignments and no command yields none."""
+    assert extract_command_prefix("FOO=1 BAR=2") == "none"
+
+
+def test_extract_command_prefix_env_with_two_word_command():
+    """Env assignments before a two-word command keep the two-word prefix."""
+    assert extract_command_prefix("CI=1 git push origin") == "git push"
 
 
 def test_extract_command_prefix_pipe():
-    """Piped commands - shlex handles pipe character."""
+    """Piped commands - only the first command is considered."""
     result = extract_command_prefix("cat file.txt | grep pattern")
     assert result in ("cat", "cat file.txt")
 
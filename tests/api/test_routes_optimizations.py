@@ -116,6 +116,31 @@ def test_count_tokens_endpoint(client):
     assert response.json()["input_tokens"] == 5
 
 
+def test_count_tokens_runs_off_event_loop(client):
+    """Token counting is dispatched to a worker thread, not the event loop."""
+    import asyncio
+
+    payload = {
+        "model": "claude-3-sonnet",
+        "messages": [{"role": "user", "content": "hello"}],
+    }
+    loop_running: list[bool] = []
+
+    def fake_count(*args):
+        try:
+            asyncio.get_running_loop()
+            loop_running.append(True)
+        except RuntimeError:
+            loop_running.append(False)
+        return 7
+
+    with patch("api.routes.get_token_count", side_effect=fake_count):
+        response = client.post("/v1/messages/count_tokens", json=payload)
+
+    assert response.json()["input_tokens"] == 7
+    assert loop_running == [False]
+
+
 def test_count_tokens_error_returns_500(client):
     """When get_token_count raises, count_tokens returns 500."""
     payload = {
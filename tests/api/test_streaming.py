@@ -0,0 +1,97 @@
+"""Tests for api/streaming.py SSE coalescing."""
+
+import asyncio
+
+import pytest
+
+from api.streaming import coalesce_sse_events
+
+
+def _delta(text: str) -> str:
+    return f"event: content_block_delta\ndata: {text}\n\n"
+
+
+MESSAGE_START = "event: message_start\ndata: {}\n\n"
+BLOCK_STOP = "event: content_block_stop\ndata: {}\n\n"
+
+
+async def _collect(stream) -> list[str]:
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_consecutive_deltas_are_merged_and_bytes_preserved():
+    """Deltas are joined into one chunk; output bytes match the input."""
+
+    async def source():
+        yield MESSAGE_START
+        for i in range(5):
+            yield _delta(str(i))
+        yield BLOCK_STOP
+
+    events = [MESSAGE_START, *[_delta(str(i)) for i in range(5)], BLOCK_STOP]
+    chunks = await _collect(coalesce_sse_events(source()))
+
+    assert chunks == [MESSAGE_START, "".join(events[1:6]), BLOCK_STOP]
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_max_bytes_reached():
+    """Buffered deltas are flushed once they reach max_bytes."""
+
+    async def source():
+        for i in range(4):
+            yield _delta(str(i))
+
+    size = len(_delta("0"))
+    chunks = await _collect(coalesce_sse_events(source(), max_bytes=2 * size))
+
+    assert chunks == [_delta("0") + _delta("1"), _delta("2") + _delta("3")]
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_max_delay_when_source_stalls():
+    """A stalled source does not hold buffered deltas past max_delay."""
+
+    async def source():
+        yield _delta("a")
+        await asyncio.sleep(0.05)
+        yield _delta("b")
+
+    chunks = await _collect(coalesce_sse_events(source(), max_delay=0.005))
+
+    assert chunks == [_delta("a"), _delta("b")]
+
+
+@pytest.mark.asyncio
+async def test_source_error_propagates_after_flush():
+    """Source exceptions are re-raised after buffered deltas are sent."""
+
+    async def source():
+        yield _delta("a")
+        raise ValueError("upstream failed")
+
+    stream = coalesce_sse_events(source())
+    assert await anext(stream) == _delta("a")
+    with pytest.raises(ValueError, match="upstream failed"):
+        await anext(stream)
+
+
+@pytest.mark.asyncio
+async def test_closing_consumer_closes_source():
+    """Closing the coalesced stream closes the provider generator."""
+    closed = asyncio.Event()
+
+    async def source():
+        try:
+            while True:
+                yield MESSAGE_START
+                await asyncio.sleep(0.001)
+        finally:
+            closed.set()
+
+    stream = coalesce_sse_events(source())
+    assert await anext(stream) == MESSAGE_START
+    await stream.aclose()
+
+    assert closed.is_set()
@@ -66,11 +66,12 @@ def test_log_request_compact_logs_summary_and_full_payload():
     request_data.system = None
     request_data.thinking = None
     request_data.max_tokens = 1
-    request_data.model_dump.return_value = {"model": "m"}
+    request_data.model_dump_json.return_value = '{"model":"m"}'
 
     log_request_compact(logger, "req_1", request_data)
     assert logger.info.call_count == 1
     assert logger.debug.call_count >= 1  # full payload
+    assert '{"model":"m"}' in logger.debug.call_args.args[0]
 
 
 def test_log_request_compact_handles_model_dump_failures():
@@ -82,7 +83,7 @@ def test_log_request_compact_handles_model_dump_failures():
     request_data.system = None
     request_data.thinking = None
     request_data.max_tokens = 1
-    request_data.model_dump.side_effect = RuntimeError("nope")
+    request_data.model_dump_json.side_effect = RuntimeError("nope")
 
     from providers import logging_utils as logging_utils_mod
 
@@ -82,6 +82,17 @@ def test_render_markdown_unclosed_markdown():
     assert "bold" in out
 
 
+def test_escape_md_v2_escapes_every_special_char():
+    """Every MarkdownV2 special char gets exactly one leading backslash."""
+    from messaging.telegram_markdown import escape_md_v2_link_url
+
+    specials = "\\_*[]()~`>#+-=|{}.!"
+    assert escape_md_v2(specials) == "".join(f"\\{ch}" for ch in specials)
+    assert escape_md_v2("a.b") == "a\\.b"
+    assert escape_md_v2_code("a\\`b") == "a\\\\\\`b"
+    assert escape_md_v2_link_url("https://x.y/(a)") == "https://x.y/(a\\)"
+
+
 def test_escape_md_v2_unicode_emoji():
     """Unicode and emoji pass through correctly (no special char escaping needed)."""
     from messaging.telegram_markdown import escape_md_v2, escape_md_v2_code
@@ -111,3 +111,263 @@ def test_transcribe_local_import_error_raises():
             transcribe_audio(path, "audio/ogg")
     finally:
         path.unlink(missing_ok=True)
+
+
+def test_get_pipeline_cuda_compiles_chunks_and_warms_up():
+    """CUDA load compiles the decoder step at batch size 1 and warms up."""
+    from messaging import transcription
+
+    fake_torch = MagicMock()
+    fake_torch.cuda.is_available.return_value = True
+    compiled_forward = MagicMock()
+    fake_torch.compile.return_value = compiled_forward
+
+    fake_transformers = MagicMock()
+    model = fake_transformers.AutoModelForSpeechSeq2Seq.from_pretrained.return_value
+    model = model.to.return_value
+    original_forward = model.forward
+    fake_pipe = MagicMock()
+    fake_transformers.pipeline.return_value = fake_pipe
+
+    with (
+        patch.dict(
+            "sys.modules", {"torch": fake_torch, "transformers": fake_transformers}
+        ),
+        patch.dict(transcription._pipeline_cache, clear=True),
+    ):
+        pipe = transcription._get_pipeline("openai/whisper-base", "cuda")
+
+    assert pipe is fake_pipe
+    fake_torch.compile.assert_called_once_with(original_forward, mode="reduce-overhead")
+    assert model.forward is compiled_forward
+    assert model.generation_config.cache_implementation == "static"
+    pipeline_kwargs = fake_transformers.pipeline.call_args.kwargs
+    assert pipeline_kwargs["model"] is model
+    assert pipeline_kwargs["chunk_length_s"] == 30
+    assert pipeline_kwargs["batch_size"] == 1
+    fake_pipe.assert_called_once()
+
+
+def test_get_pipeline_cpu_skips_compile_and_warmup():
+    """CPU load does not compile or warm up the pipeline."""
+    from messaging import transcription
+
+    fake_torch = MagicMock()
+    fake_transformers = MagicMock()
+    fake_pipe = MagicMock()
+    fake_transformers.pipeline.return_value = fake_pipe
+
+    with (
+        patch.dict(
+            "sys.modules", {"torch": fake_torch, "transformers": fake_transformers}
+        ),
+        patch.dict(transcription._pipeline_cache, clear=True),
+    ):
+        transcription._get_pipeline("openai/whisper-base", "cpu")
+
+    fake_torch.compile.assert_not_called()
+    assert fake_transformers.pipeline.call_args.kwargs["batch_size"] == 8
+    model = fake_transformers.AutoModelForSpeechSeq2Seq.from_pretrained.return_value
+    assert model.to.return_value.generation_config.cache_implementation != "static"
+    fake_pipe.assert_not_called()
+
+
+def test_preload_pipeline_resolves_model_name():
+    """Preload loads the pipeline for the resolved model ID."""
+    from messaging import transcription
+
+    with patch.object(transcription, "_get_pipeline") as mock_get:
+        transcription.preload_pipeline("base", "cuda")
+
+    mock_get.assert_called_once_with("openai/whisper-base", "cuda")
+
+
+def test_preload_pipeline_failure_is_logged_not_raised():
+    """A failed preload leaves loading to the first voice note."""
+    from messaging import transcription
+
+    with (
+        patch.object(
+            transcription, "_get_pipeline", side_effect=ImportError("no voice extra")
+        ),
+        patch.object(transcription.logger, "warning") as mock_warning,
+    ):
+        transcription.preload_pipeline("base", "cuda")
+
+    mock_warning.assert_called_once()
+
+
+def test_get_pipeline_concurrent_callers_load_once():
+    """A caller arriving during a load waits for it instead of loading again."""
+    import threading
+    import time
+
+    from messaging import transcription
+
+    fake_pipe = MagicMock()
+
+    def slow_load(model_id, device):
+        time.sleep(0.05)
+        return fake_pipe
+
+    with (
+        patch.dict(transcription._pipeline_cache, clear=True),
+        patch.object(
+            transcription, "_load_pipeline", side_effect=slow_load
+        ) as mock_load,
+    ):
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    transcription._get_pipeline("openai/whisper-base", "cuda")
+                )
+            )
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    mock_load.assert_called_once()
+    assert results == [fake_pipe, fake_pipe]
+
+
+def test_transcribe_cache_reuses_identical_audio(tmp_path):
+    """Byte-identical audio is transcribed once when caching is enabled."""
+    from messaging import transcription
+
+    first = tmp_path / "a.ogg"
+    second = tmp_path / "b.ogg"
+    first.write_bytes(b"same voice note")
+    second.write_bytes(b"same voice note")
+
+    with (
+        patch.dict(transcription._transcript_cache, clear=True),
+        patch(
+            "messaging.transcription._transcribe_local", return_value="Hi"
+        ) as mock_local,
+    ):
+        assert transcribe_audio(first, "audio/ogg", use_cache=True) == "Hi"
+        assert transcribe_audio(second, "audio/ogg", use_cache=True) == "Hi"
+
+    mock_local.assert_called_once()
+
+
+def test_transcribe_cache_keyed_by_model(tmp_path):
+    """Same audio with a different model is transcribed again."""
+    from messaging import transcription
+
+    path = tmp_path / "a.ogg"
+    path.write_bytes(b"voice")
+
+    with (
+        patch.dict(transcription._transcript_cache, clear=True),
+        patch(
+            "messaging.transcription._transcribe_local", return_value="Hi"
+        ) as mock_local,
+    ):
+        transcribe_audio(path, "audio/ogg", whisper_model="base", use_cache=True)
+        transcribe_audio(path, "audio/ogg", whisper_model="tiny", use_cache=True)
+
+    assert mock_local.call_count == 2
+
+
+def test_transcribe_cache_disabled_always_transcribes(tmp_path):
+    """Without use_cache every call runs the model and nothing is stored."""
+    from messaging import transcription
+
+    path = tmp_path / "a.ogg"
+    path.write_bytes(b"voice")
+
+    with (
+        patch.dict(transcription._transcript_cache, clear=True),
+        patch(
+            "messaging.transcription._transcribe_local", return_value="Hi"
+        ) as mock_local,
+    ):
+        transcribe_audio(path, "audio/ogg")
+        transcribe_audio(path, "audio/ogg")
+        assert len(transcription._transcript_cache) == 0
+
+    assert mock_local.call_count == 2
+
+
+def test_transcribe_cache_evicts_oldest_entry(tmp_path):
+    """Cache drops the oldest transcript once it exceeds its size cap."""
+    from messaging import transcription
+
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"{i}.ogg"
+        path.write_bytes(f"voice {i}".encode())
+        paths.append(path)
+
+    with (
+        patch.dict(transcription._transcript_cache, clear=True),
+        patch.object(transcription, "_TRANSCRIPT_CACHE_MAX_ENTRIES", 2),
+        patch(
+            "messaging.transcription._transcribe_local", return_value="Hi"
+        ) as mock_local,
+    ):
+        for path in paths:
+            transcribe_audio(path, "audio/ogg", use_cache=True)
+        assert len(transcription._transcript_cache) == 2
+        transcribe_audio(paths[0], "audio/ogg", use_cache=True)
+
+    assert mock_local.call_count == 4
+
+
+def test_get_pipeline_switching_model_evicts_previous():
+    """Loading a different model drops the old pipeline and frees GPU cache."""
+    from messaging import transcription
+
+    fake_torch = MagicMock()
+    fake_torch.cuda.is_available.return_value = True
+    fake_transformers = MagicMock()
+    fake_transformers.pipeline.side_effect = [MagicMock(), MagicMock()]
+
+    with (
+        patch.dict(
+            "sys.modules", {"torch": fake_torch, "transformers": fake_transformers}
+        ),
+        patch.dict(transcription._pipeline_cache, clear=True),
+    ):
+        first = transcription._get_pipeline("openai/whisper-base", "cpu")
+        assert transcription._get_pipeline("openai/whisper-base", "cpu") is first
+        fake_torch.cuda.empty_cache.assert_not_called()
+
+        second = transcription._get_pipeline("openai/whisper-tiny", "cpu")
+
+        assert second is not first
+        assert list(transcription._pipeline_cache) == [("openai/whisper-tiny", "cpu")]
+        fake_torch.cuda.empty_cache.assert_called_once()
+
+    first.model.to.assert_called_with("cpu")
+    fake_torch.compiler.reset.assert_not_called()
+
+
+def test_get_pipeline_switching_cuda_model_resets_compiler():
+    """Evicting a compiled CUDA pipeline moves it off the GPU and resets dynamo."""
+    from messaging import transcription
+
+    fake_torch = MagicMock()
+    fake_torch.cuda.is_available.return_value = True
+    fake_transformers = MagicMock()
+    fake_transformers.pipeline.side_effect = [MagicMock(), MagicMock()]
+
+    with (
+        patch.dict(
+            "sys.modules", {"torch": fake_torch, "transformers": fake_transformers}
+        ),
+        patch.dict(transcription._pipeline_cache, clear=True),
+    ):
+        first = transcription._get_pipeline("openai/whisper-base", "cuda")
+        fake_torch.compiler.reset.assert_not_called()
+
+        transcription._get_pipeline("openai/whisper-tiny", "cuda")
+
+    first.model.to.assert_called_with("cpu")
+    fake_torch.compiler.reset.assert_called_once()
+    fake_torch.cuda.empty_cache.assert_called_once()